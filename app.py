@@ -1,15 +1,381 @@
+import argparse
+import base64
+import bisect
+import gzip
+import hashlib
+import hmac
+import json
+import math
+import mimetypes
 import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+import tomllib
+from collections import Counter, OrderedDict, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
 from pathlib import Path
+from urllib.parse import urlsplit
 
+import brotli
+import httpx
 import modal
 from fasthtml import common as fh
-from simpleicons.icons import si_github
+from starlette.concurrency import run_in_threadpool
+from starlette.convertors import CONVERTOR_TYPES
+from starlette.middleware import Middleware
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.sessions import SessionMiddleware
 
 # -----------------------------------------------------------------------------
 
 NAME = "engr110"
 PARENT_PATH = Path(__file__).parent
+ASSETS_PATH = PARENT_PATH / "assets"
+BLOG_PATH = PARENT_PATH / "blog"  # one weekly report per <date>.toml
+BLOG_PAGE_SIZE = 3  # reports per /blog page, older ones load on scroll
+DIST_PATH = PARENT_PATH / "dist"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# briefly fresh, so the click after a prefetch is answered by the browser's cache
+PREFETCH_CACHE_CONTROL = "private, max-age=30"
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+    "image/vnd.microsoft.icon",
+)
+ENCODINGS = ("br", "gzip")  # in order of preference
+# responsive variants of the photos, built into assets/img/ by `python app.py images`
+IMAGE_SOURCES = (
+    "example.png",
+    "andrew.jpeg",
+    "pranav.jpeg",
+    "gigi.jpeg",
+    "stasiia.jpeg",
+)
+IMAGE_WIDTHS = (160, 320, 480, 640, 960)  # plus the original, never upscaled
+IMAGE_PLACEHOLDER_WIDTH = 16  # px of the blurred stand-in inlined until a photo loads
+IMAGE_FORMATS = {  # format -> (MIME type, encoder quality), best first
+    "avif": ("image/avif", 50),
+    "webp": ("image/webp", 75),
+}
+# third-party scripts the pages need, bundled into one asset by `python app.py vendor`
+VENDOR_SCRIPTS = (
+    "https://unpkg.com/htmx.org@2.0.4/dist/htmx.min.js",
+    "https://cdn.jsdelivr.net/gh/answerdotai/surreal@main/surreal.js",  # for toasts
+)
+# fasthtml's picolink, pinned, self-hosted by `python app.py vendor` as well
+PICO_CSS = "https://cdn.jsdelivr.net/npm/@picocss/pico@2.1.1/css/pico.min.css"
+# unlayered, so utilities keep winning over fasthtml's pico.css like the old CDN build
+TAILWIND_IMPORTS = """
+@import "tailwindcss/theme.css";
+@import "tailwindcss/preflight.css";
+@import "tailwindcss/utilities.css" source(none);
+"""
+# served as /sw.js after the `CACHE` name and `PRECACHE` URLs it is built with
+SERVICE_WORKER_JS = """
+const HASHED = /^\\/assets\\/.+\\.[0-9a-f]{8}\\.\\w+$/;
+
+self.addEventListener("install", event => {
+    event.waitUntil(
+        caches.open(CACHE).then(cache => cache.addAll(PRECACHE)).then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener("activate", event => {  // drop the caches of older deploys
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(keys.filter(key => key !== CACHE).map(key => caches.delete(key))))
+            .then(() => self.clients.claim())
+    );
+});
+
+function cacheable(response) {
+    return response.ok && !(response.headers.get("Cache-Control") || "").includes("no-store");
+}
+
+async function cacheFirst(request) {
+    const cache = await caches.open(CACHE);
+    const cached = await cache.match(request);
+    if (cached) return cached;
+    const response = await fetch(request);
+    if (cacheable(response)) cache.put(request, response.clone());
+    return response;
+}
+
+async function staleWhileRevalidate(event, key) {
+    const cache = await caches.open(CACHE);
+    const cached = await cache.match(key, {ignoreVary: true});
+    const network = fetch(event.request).then(response => {
+        if (cacheable(response)) cache.put(key, response.clone());
+        return response;
+    });
+    if (!cached) return network;
+    event.waitUntil(network.catch(() => {}));
+    return cached;
+}
+
+self.addEventListener("fetch", event => {
+    const request = event.request;
+    const url = new URL(request.url);
+    if (request.method !== "GET" || url.origin !== location.origin) return;
+    if (HASHED.test(url.pathname)) {
+        event.respondWith(cacheFirst(request));
+    } else if (request.mode === "navigate" || request.headers.has("HX-Request")) {
+        // boosted navigations get a fragment, so it is cached apart from the page
+        const fragment = request.headers.has("HX-Request")
+            && !request.headers.has("HX-History-Restore-Request");
+        if (fragment) url.searchParams.set("hx-fragment", "");
+        event.respondWith(staleWhileRevalidate(event, url.href));
+    }
+});
+"""
+
+
+def etag_for(body: bytes) -> str:
+    """Strong ETag derived from the content hash of `body`."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(req, etag: str) -> bool:
+    """Whether the request's `If-None-Match` header already covers `etag`."""
+    if_none_match = req.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def encode_variants(body: bytes, headers: dict) -> dict[str, tuple[bytes, dict]]:
+    """Identity, Brotli and gzip representations of `body`, each with full headers.
+
+    Compressed variants are only kept when they are smaller than `body`.
+    """
+    etag = etag_for(body)
+    headers = {**headers, "Content-Length": str(len(body)), "ETag": etag}
+    variants = {"identity": (body, headers)}
+    if not headers["Content-Type"].startswith(COMPRESSIBLE_TYPES):
+        return variants
+    headers["Vary"] = ", ".join(filter(None, (headers.get("Vary"), "Accept-Encoding")))
+    encoded = {
+        "br": brotli.compress(body, quality=11),
+        "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+    }
+    for encoding in ENCODINGS:
+        if len(encoded[encoding]) < len(body):
+            variants[encoding] = (
+                encoded[encoding],
+                {
+                    **headers,
+                    "Content-Encoding": encoding,
+                    "Content-Length": str(len(encoded[encoding])),
+                    "ETag": f'{etag[:-1]}-{encoding}"',
+                },
+            )
+    return variants
+
+
+def accepted_encodings(req) -> set[str]:
+    """Codings listed in the request's `Accept-Encoding`, minus any with `q=0`."""
+    accepted = set()
+    for coding in req.headers.get("accept-encoding", "").replace(" ", "").split(","):
+        name, _, q = coding.partition(";q=")
+        if name and q not in ("0", "0.0", "0.00", "0.000"):
+            accepted.add(name.lower())
+    return accepted
+
+
+def serve_variants(
+    req, variants: dict[str, tuple[bytes, dict]], status_code: int = 200
+) -> fh.Response:
+    """Serve the best precompressed variant `req` accepts, or a 304 if it's cached."""
+    encoding = "identity"
+    if len(variants) > 1:
+        accepted = accepted_encodings(req)
+        encoding = next(
+            (e for e in ENCODINGS if e in variants and e in accepted), encoding
+        )
+    body, headers = variants[encoding]
+    if etag_matches(req, headers["ETag"]):
+        return fh.Response(
+            status_code=304,
+            headers={
+                k: v
+                for k, v in headers.items()
+                if k in ("ETag", "Cache-Control", "Vary")
+            },
+        )
+    return fh.Response(body, status_code=status_code, headers=headers)
+
+
+SLOT_RE = re.compile(r"<!--slot:(\w+)-->")
+
+
+def slot(name: str) -> fh.NotStr:
+    """Placeholder for per-request markup, filled by `fill_template`."""
+    return fh.NotStr(f"<!--slot:{name}-->")
+
+
+def compile_template(html: str) -> list[bytes | str]:
+    """Split `html` into static byte chunks and the names of the slots between them."""
+    parts = SLOT_RE.split(html)  # text, name, text, ...
+    return [part if i % 2 else part.encode() for i, part in enumerate(parts)]
+
+
+def fill_template(template: list[bytes | str], slots: dict[str, bytes]) -> bytes:
+    """Splice `slots` into a compiled template, leaving missing ones empty."""
+    return b"".join(
+        slots.get(part, b"") if isinstance(part, str) else part for part in template
+    )
+
+
+# the current request's phase timings, shared with the threadpool work it awaits
+REQUEST_TIMINGS: ContextVar[dict | None] = ContextVar("request_timings", default=None)
+
+
+@contextmanager
+def timed(phase: str):
+    """Add the time spent in the block to the current request's `phase` timing."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if (timings := REQUEST_TIMINGS.get()) is not None:
+            timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - start
+
+
+def note_cache(hit: bool):
+    """Record whether the current request was served from a response cache."""
+    if (timings := REQUEST_TIMINGS.get()) is not None:
+        timings["cache"] = "hit" if hit else "miss"
+
+
+def fingerprint(path: Path) -> str:
+    """`name.ext` -> `name.<content hash>.ext`, so the name changes with the file."""
+    digest = hashlib.blake2b(path.read_bytes(), digest_size=4).hexdigest()
+    return f"{path.stem}.{digest}{path.suffix}"
+
+
+def build_asset_manifest(assets_path: Path = ASSETS_PATH) -> dict[str, str]:
+    """Map each file under `assets_path` to its fingerprinted URL."""
+    manifest = {}
+    for path in sorted(assets_path.rglob("*")):
+        if path.is_file():
+            name = path.relative_to(assets_path)
+            manifest[name.as_posix()] = (
+                f"/assets/{name.with_name(fingerprint(path)).as_posix()}"
+            )
+    return manifest
+
+
+ASSET_MANIFEST = build_asset_manifest()
+
+
+def asset_url(name: str) -> str:
+    """Fingerprinted URL for the asset `name`, falling back to its plain URL."""
+    return ASSET_MANIFEST.get(name, f"/assets/{name}")
+
+
+SVG_VIEWBOX_RE = re.compile(rb'viewBox="[\d.]+ [\d.]+ ([\d.]+) ([\d.]+)"')
+
+
+def image_size(body: bytes) -> tuple[int, int] | None:
+    """Width and height of a PNG, JPEG or SVG image, read from its header."""
+    if body.startswith(b"\x89PNG"):
+        return int.from_bytes(body[16:20]), int.from_bytes(body[20:24])
+    if body.startswith(b"\xff\xd8"):  # walk the segments to the start of frame
+        i = 2
+        while i + 9 < len(body):
+            marker, length = body[i + 1], int.from_bytes(body[i + 2 : i + 4])
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = body[i + 5 : i + 7], body[i + 7 : i + 9]
+                return int.from_bytes(width), int.from_bytes(height)
+            i += 2 + length
+    elif match := SVG_VIEWBOX_RE.search(body):
+        return round(float(match[1])), round(float(match[2]))
+    return None
+
+
+def build_image_index(assets_path: Path = ASSETS_PATH) -> dict[str, dict]:
+    """Map each image asset to its `width`, `height` and, once `python app.py images`
+    has built one, the data URI of its blurred `placeholder`.
+    """
+    index = {}
+    for name in ASSET_MANIFEST:
+        mime = mimetypes.guess_type(name)[0] or ""
+        if not mime.startswith("image/") or name.startswith("img/"):
+            continue
+        if size := image_size((assets_path / name).read_bytes()):
+            index[name] = dict(zip(("width", "height"), size, strict=True))
+            placeholder = assets_path / "img" / f"{Path(name).stem}-lqip.webp"
+            if placeholder.exists():
+                data = base64.b64encode(placeholder.read_bytes()).decode()
+                index[name]["placeholder"] = f"data:image/webp;base64,{data}"
+    return index
+
+
+IMAGE_INDEX = build_image_index()
+
+
+def image_attrs(name: str) -> dict[str, str | int]:
+    """`<img>` attributes that reserve the asset `name`'s box and paint its
+    placeholder there until it loads.
+    """
+    meta = IMAGE_INDEX.get(name, {})
+    attrs = {key: meta[key] for key in ("width", "height") if key in meta}
+    if "placeholder" in meta:
+        attrs["style"] = f"background:url({meta['placeholder']}) center/cover"
+    return attrs
+
+
+# fasthtml's `static` path parameter predates AVIF
+fh.reg_re_param("static", "avif|" + CONVERTOR_TYPES["static"].regex)
+
+
+def image_variants(name: str) -> dict[str, list[tuple[int, str]]]:
+    """Built `(width, url)` variants of the asset `name` per format, narrowest first."""
+    stem = Path(name).stem
+    variants = {}
+    for fmt in IMAGE_FORMATS:
+        pattern = re.compile(rf"img/{re.escape(stem)}-(\d+)\.{fmt}")
+        variants[fmt] = sorted(
+            (int(match[1]), url)
+            for variant, url in ASSET_MANIFEST.items()
+            if (match := pattern.fullmatch(variant))
+        )
+    return variants
+
+
+def load_assets(assets_path: Path = ASSETS_PATH) -> dict[str, tuple[bytes, dict]]:
+    """Read every asset into memory, keyed by each URL it is served under."""
+    store = {}
+    for name, hashed_url in ASSET_MANIFEST.items():
+        body = (assets_path / name).read_bytes()
+        headers = {
+            "Content-Type": mimetypes.guess_type(name)[0] or "application/octet-stream"
+        }
+        store[hashed_url] = body, {**headers, "Cache-Control": IMMUTABLE_CACHE_CONTROL}
+        for url in (f"/assets/{name}", f"/{name}"):  # unversioned, so revalidate
+            store[url] = body, {**headers, "Cache-Control": "no-cache"}
+    return store
+
+
+def load_posts(blog_path: Path = BLOG_PATH) -> list[dict]:
+    """Parse every weekly report, newest first.
+
+    Each report has a `date`, and optionally `notes` (paragraphs), `team` and
+    `members` (name -> bullets) and `docs` (embedded documents with a `title`, `url`
+    and optional `thumb` asset). A bullet is a string or a table with `text` and
+    nested `items`.
+    """
+    posts = [tomllib.loads(path.read_text()) for path in blog_path.glob("*.toml")]
+    return sorted(posts, key=lambda post: post["date"], reverse=True)
 
 
 def get_app():  # noqa: C901
@@ -21,58 +387,175 @@ def get_app():  # noqa: C901
     page_ctnt_cls = "w-full flex flex-col items-center gap-8"
     link_cls = "text-blue-300 hover:text-blue-100"
 
-    def _not_found(req, exc):
+    async def _not_found(req, exc):
+        if "." in req.url.path.rsplit("/", 1)[-1]:  # missing files (and bot scans)
+            return fh.Response(
+                "404 Not Found",
+                status_code=404,
+                media_type="text/plain",
+                headers={"Cache-Control": cache_policy["not-found"]},
+            )
+        return await cached_page(req, "404", not_found_page, status_code=404)
+
+    def not_found_page():
         message = "Page not found!"
         typing_steps = len(message)
         return (
             fh.Title(NAME + " | 404"),
-            fh.Div(
-                nav(),
-                fh.Main(
-                    fh.Div(
-                        fh.P(
-                            message,
-                            hx_indicator="#spinner",
-                            cls="text-2xl text-red-300 animate-typing overflow-hidden whitespace-nowrap border-r-4 border-red-300",
-                            style=f"animation: typing 2s steps({typing_steps}, end), blink-caret .75s step-end infinite",
-                        ),
-                    ),  # to contain typing animation
-                    cls=main_ctnr_cls,
-                ),
-                toast_container(),
-                footer(),
-                cls=page_cls,
+            fh.Main(
+                fh.Div(
+                    fh.P(
+                        message,
+                        hx_indicator="#spinner",
+                        cls="text-2xl text-red-300 animate-typing overflow-hidden whitespace-nowrap border-r-4 border-red-300",
+                        style=f"animation: typing 2s steps({typing_steps}, end), blink-caret .75s step-end infinite",
+                    ),
+                ),  # to contain typing animation
+                cls=main_ctnr_cls,
             ),
         )
 
-    f_app, _ = fh.fast_app(
-        ws_hdr=True,
-        exception_handlers={404: _not_found},
-        hdrs=[
-            fh.Script(src="https://cdn.tailwindcss.com"),
-            fh.HighlightJS(langs=["python", "javascript", "html", "css"]),
-            fh.Link(rel="icon", href="/favicon.ico", type="image/x-icon"),
-            fh.Style(
-                """
-                @keyframes typing {
-                from { width: 0; }
-                to { width: 100%; }
-                }
-                @keyframes blink-caret {
-                    from, to { border-color: transparent; }
-                    50% { border-color: red; }
-                }
-                .htmx-swapping {
-                    opacity: 0;
-                    transition: opacity .25s ease-out;
+    def sessions_if_needed(app, **session_kw):
+        """`SessionMiddleware`, skipped for files and reads without a session cookie.
+
+        Skipping it saves decoding and re-signing the cookie, and keeps `Set-Cookie`
+        off pages and assets, so shared caches can store them.
+        """
+        with_sessions = SessionMiddleware(app, **session_kw)
+        cookie = session_kw["session_cookie"].encode() + b"="
+
+        async def asgi(scope, receive, send):
+            if (
+                scope["type"] == "http"
+                and scope["method"] in ("GET", "HEAD")
+                and (
+                    "." in scope["path"].rsplit("/", 1)[-1]
+                    or not any(
+                        name == b"cookie" and cookie in value
+                        for name, value in scope["headers"]
+                    )
+                )
+            ):
+                return await app(scope, receive, send)
+            return await with_sessions(scope, receive, send)
+
+        return asgi
+
+    # the one <head> every page shares: boosted navigation keeps the first page's, so
+    # it has to carry whatever any page needs
+    if "vendor/bundle.js" in ASSET_MANIFEST:
+        scripts = (fh.Script(src=asset_url("vendor/bundle.js"), defer=True),)
+    else:  # not vendored (e.g. local dev), so fall back to the CDNs
+        scripts = tuple(fh.Script(src=src, defer=True) for src in VENDOR_SCRIPTS)
+    # Pico stays a blocking stylesheet: it styles the whole page, and at ~80 KB it is
+    # too big to inline in every response, so it is self-hosted and preloaded instead
+    if "vendor/pico.min.css" in ASSET_MANIFEST:
+        pico = fh.Link(rel="stylesheet", href=asset_url("vendor/pico.min.css"))
+    else:
+        pico = fh.Link(rel="stylesheet", href=PICO_CSS)
+    head_deps = (
+        fh.charset,
+        fh.viewport,
+        pico,
+        fh.Style(":root { --pico-font-size: 100%; }"),  # as fasthtml's picolink
+        # inlined whole: ~10 KB, so <main> is styled on first paint without
+        # waiting on a second request or shifting once it arrives
+        fh.Style((ASSETS_PATH / "styles.css").read_text()),
+        fh.Link(rel="icon", href=asset_url("favicon.ico"), type="image/x-icon"),
+        fh.Style(
+            """
+            @keyframes typing {
+            from { width: 0; }
+            to { width: 100%; }
+            }
+            @keyframes blink-caret {
+                from, to { border-color: transparent; }
+                50% { border-color: red; }
+            }
+            .htmx-swapping {
+                opacity: 0;
+                transition: opacity .25s ease-out;
+            }
+            """
+        ),
+        *scripts,
+        fh.Style(fh.toast_css),
+        fh.ToastJs(10.0),
+        fh.Script(
+            """
+            document.addEventListener("click", event => {
+                const facade = event.target.closest("[data-facade]");
+                if (!facade) return;
+                const iframe = document.createElement("iframe");
+                iframe.src = facade.dataset.facade;
+                iframe.title = facade.title;
+                iframe.className = facade.dataset.frameCls;
+                iframe.allow = facade.dataset.allow || "";
+                iframe.allowFullscreen = true;
+                facade.replaceWith(iframe);
+            });
+            """
+        ),
+        fh.Script(
+            """
+            (() => {
+                const connection = navigator.connection;
+                if (connection && (connection.saveData || /2g/.test(connection.effectiveType))) return;
+                const done = new Set(), recent = [];
+                function prefetch(link) {
+                    if (done.has(link.href) || link.href === location.href) return;
+                    const now = Date.now();
+                    while (recent.length && now - recent[0] > 10000) recent.shift();
+                    if (recent.length >= 4) return;  // at most 4 per 10 s
+                    done.add(link.href);
+                    recent.push(now);
+                    // the same headers as htmx's boosted request, which the response varies on
+                    fetch(link.href, {headers: {"HX-Request": "true", "Purpose": "prefetch"}, priority: "low"})
+                        .catch(() => done.delete(link.href));
                 }
-                """
-            ),
-        ],
+                const navLink = target => target.closest && target.closest("nav a[href^='/']");
+                let hover;
+                document.addEventListener("mouseover", event => {
+                    const link = navLink(event.target);
+                    clearTimeout(hover);
+                    if (link) hover = setTimeout(() => prefetch(link), 65);  // intent, not a pass-over
+                });
+                document.addEventListener("mouseout", () => clearTimeout(hover));
+                document.addEventListener("touchstart", event => {
+                    const link = navLink(event.target);
+                    if (link) prefetch(link);
+                }, {passive: true});
+                const idle = window.requestIdleCallback || setTimeout;
+                const seen = new IntersectionObserver(entries => entries.forEach(entry => {
+                    if (entry.isIntersecting) idle(() => prefetch(entry.target));
+                }));
+                document.addEventListener("DOMContentLoaded", () =>
+                    document.querySelectorAll("nav a[href^='/']").forEach(link => seen.observe(link)));
+            })();
+            """
+        ),
+        fh.Script(
+            'if ("serviceWorker" in navigator) navigator.serviceWorker.register("/sw.js");'
+        ),
+    )
+
+    f_app, _ = fh.fast_app(  # pages render their own <head> from `head_deps`
+        default_hdrs=False,
         live=os.getenv("LIVE", False),
         debug=os.getenv("DEBUG", False),
-        boost=True,
     )
+    # registered on starlette directly, since fasthtml's wrapper deep-copies every
+    # header per call and `_not_found` already returns finished responses
+    f_app.exception_handlers[404] = _not_found
+    # sessions only hold pending toasts, which need a session cookie to exist
+    f_app.user_middleware[:] = [
+        Middleware(sessions_if_needed, **mw.kwargs)
+        if mw.cls is SessionMiddleware
+        else mw
+        for mw in f_app.user_middleware
+    ]
+    # fasthtml's catch-all static route serves from the cwd; assets are served below
+    f_app.routes[:] = [r for r in f_app.routes if r.name != "static_route_exts_get"]
     fh.setup_toasts(f_app)
     f_app.add_middleware(
         CORSMiddleware,
@@ -82,7 +565,323 @@ def get_app():  # noqa: C901
         allow_headers=["*"],
     )
 
+    ## rate limiting for writes, before sessions are decoded or forms parsed
+    write_methods = ("POST", "PUT", "PATCH", "DELETE")
+    rate_burst, rate_refill = 5, 0.5  # tokens per client, tokens per second
+    max_rate_clients = 10_000  # past this, the least recently seen bucket is dropped
+    buckets = OrderedDict()  # client -> (tokens, when they were counted)
+
+    # proxies in front that append to X-Forwarded-For; with none, it is ignored
+    f_app.state.proxy_hops = int(os.getenv("TRUSTED_PROXY_HOPS", "0"))
+
+    def client_of(scope):
+        """The client's address, as seen by the outermost of `proxy_hops` trusted
+        proxies, or None if it is unknown.
+
+        Only the entries those proxies appended are used, as a client can put
+        anything before them.
+        """
+        peer = (scope.get("client") or (None,))[0]
+        if not (hops := f_app.state.proxy_hops):
+            return peer
+        forwarded = [
+            address.strip()
+            for name, value in scope["headers"]
+            if name == b"x-forwarded-for"
+            for address in value.decode("latin-1").split(",")  # obs-text is not UTF-8
+        ]
+        # fewer entries means it skipped a proxy, so the peer is all we know
+        return forwarded[-hops] if len(forwarded) >= hops else peer
+
+    def take_token(client):
+        """Spend a token from `client`'s bucket, or return the seconds until one
+        refills if it is empty.
+        """
+        now = time.monotonic()
+        tokens, last = buckets.pop(client, (rate_burst, now))
+        tokens = min(rate_burst, tokens + (now - last) * rate_refill)
+        wait = 0.0 if tokens >= 1 else (1 - tokens) / rate_refill
+        buckets[client] = (tokens if wait else tokens - 1, now)  # most recent last
+        if len(buckets) > max_rate_clients:
+            buckets.popitem(last=False)
+        return wait
+
+    def rate_limit_middleware(app):
+        """Answer writes beyond a client's rate with 429 before any other work."""
+
+        async def asgi(scope, receive, send):
+            if scope["type"] == "http" and scope["method"] in write_methods:
+                # without an address, clients would all share (and drain) one bucket
+                client = client_of(scope)
+                if client is not None and (wait := take_token(client)):
+                    resp = fh.Response(
+                        "429 Too Many Requests",
+                        status_code=429,
+                        media_type="text/plain",
+                        headers={"Retry-After": str(math.ceil(wait))},
+                    )
+                    return await resp(scope, receive, send)
+            return await app(scope, receive, send)
+
+        return asgi
+
+    f_app.add_middleware(rate_limit_middleware)  # inside metrics, so 429s are counted
+
+    ## access log, as JSON lines that a background thread writes to stdout in batches
+    # where records are written, or None for no log (ACCESS_LOG=0)
+    f_app.state.access_log = None if os.getenv("ACCESS_LOG") == "0" else sys.stdout
+    # share of successful asset requests logged, as they are most of the traffic
+    asset_log_sample = float(os.getenv("ACCESS_LOG_ASSET_SAMPLE", "0.1"))
+    log_queue = queue.Queue(maxsize=10_000)  # when full, records are dropped
+    log_batch_size, log_interval = 1000, 0.5  # records per write, seconds between
+    log_writer = None  # started by the first record
+
+    def write_access_log():
+        """Write queued records to stdout forever, in full batches while the queue
+        is backed up, and otherwise every `log_interval` so many records share a write.
+        """
+        while True:
+            batch = [log_queue.get()]
+            while len(batch) < log_batch_size:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if stream := f_app.state.access_log:
+                stream.write("".join(json.dumps(record) + "\n" for record in batch))
+                stream.flush()
+            if len(batch) < log_batch_size:  # caught up, so let records gather
+                time.sleep(log_interval)
+
+    def log_access(scope, route, status, elapsed, nbytes, timings):
+        """Queue the request's record for `write_access_log`, without ever blocking."""
+        nonlocal log_writer
+        if f_app.state.access_log is None:
+            return
+        record = {
+            "time": round(time.time(), 3),
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": route,
+            "status": status,
+            "bytes": nbytes,
+            "duration_ms": round(elapsed * 1e3, 3),
+            "cache": timings.get("cache"),
+        }
+        if route == asset_route and status < 400:
+            if random.random() >= asset_log_sample:
+                return
+            record["sample"] = asset_log_sample  # weight for counting from the log
+        if log_writer is None:
+            log_writer = threading.Thread(target=write_access_log, daemon=True)
+            log_writer.start()
+        try:
+            log_queue.put_nowait(record)
+        except queue.Full:
+            log_dropped[route] += 1
+
+    ## metrics, only updated on the event loop, so plain dicts need no locks
+    latency_buckets = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+    requests_total = Counter()  # (route, method, status) -> requests
+    # anything else is "other", so made-up methods can't grow the label set
+    known_methods = ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
+    # route -> requests per latency bucket, the last one being +Inf
+    latency_counts = defaultdict(lambda: [0] * (len(latency_buckets) + 1))
+    latency_sum = Counter()  # route -> seconds
+    response_bytes = Counter()  # route -> bytes
+    cache_total = Counter()  # (route, result) -> requests
+    render_seconds = Counter()  # (route, phase) -> seconds
+    log_dropped = Counter()  # route -> access log records dropped on a full queue
+    route_paths = {}  # endpoint -> route path, filled on first request
+
+    def route_of(scope):
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        if endpoint not in route_paths:
+            route_paths[endpoint] = next(
+                r.path for r in f_app.routes if getattr(r, "endpoint", None) is endpoint
+            )
+        return route_paths[endpoint]
+
+    def server_timing(elapsed, timings):
+        parts = [f"app;dur={elapsed * 1e3:.2f}"]
+        parts += [
+            f"{phase};dur={timings[phase] * 1e3:.2f}"
+            for phase in ("build", "serialize")
+            if phase in timings
+        ]
+        if "cache" in timings:
+            parts.append(f"cache;desc={timings['cache']}")
+        return ", ".join(parts)
+
+    def observe(scope, status, elapsed, nbytes, timings):
+        route = route_of(scope)
+        method = scope["method"] if scope["method"] in known_methods else "other"
+        requests_total[route, method, status] += 1
+        latency_counts[route][bisect.bisect_left(latency_buckets, elapsed)] += 1
+        latency_sum[route] += elapsed
+        response_bytes[route] += nbytes
+        if "cache" in timings:
+            cache_total[route, timings["cache"]] += 1
+        for phase in ("build", "serialize"):
+            if phase in timings:
+                render_seconds[route, phase] += timings[phase]
+        log_access(scope, route, status, elapsed, nbytes, timings)
+
+    def metrics_middleware(app):
+        """Time each request, adding a `Server-Timing` header and updating metrics."""
+
+        async def asgi(scope, receive, send):
+            if scope["type"] != "http":
+                return await app(scope, receive, send)
+            timings = {}
+            token = REQUEST_TIMINGS.set(timings)
+            start = time.perf_counter()
+            status, nbytes = 500, 0
+
+            async def send_timed(message):
+                nonlocal status, nbytes
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    header = server_timing(time.perf_counter() - start, timings)
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", header.encode()),
+                    ]
+                elif message["type"] == "http.response.body":
+                    nbytes += len(message.get("body", b""))
+                await send(message)
+
+            try:
+                await app(scope, receive, send_timed)
+            finally:
+                REQUEST_TIMINGS.reset(token)
+                observe(scope, status, time.perf_counter() - start, nbytes, timings)
+
+        return asgi
+
+    def render_metrics():
+        """All metrics in the Prometheus text exposition format."""
+        lines = [
+            f"# TYPE {NAME}_requests_total counter",
+            *(
+                f'{NAME}_requests_total{{route="{route}",method="{method}",status="{status}"}} {n}'
+                for (route, method, status), n in requests_total.items()
+            ),
+            f"# TYPE {NAME}_request_duration_seconds histogram",
+        ]
+        for route, counts in latency_counts.items():
+            cumulative = 0
+            for le, n in zip((*latency_buckets, "+Inf"), counts, strict=True):
+                cumulative += n
+                lines.append(
+                    f'{NAME}_request_duration_seconds_bucket{{route="{route}",le="{le}"}} {cumulative}'
+                )
+            lines += [
+                f'{NAME}_request_duration_seconds_sum{{route="{route}"}} {latency_sum[route]}',
+                f'{NAME}_request_duration_seconds_count{{route="{route}"}} {cumulative}',
+            ]
+        lines += [
+            f"# TYPE {NAME}_response_bytes_total counter",
+            *(
+                f'{NAME}_response_bytes_total{{route="{route}"}} {n}'
+                for route, n in response_bytes.items()
+            ),
+            f"# TYPE {NAME}_cache_requests_total counter",
+            *(
+                f'{NAME}_cache_requests_total{{route="{route}",result="{result}"}} {n}'
+                for (route, result), n in cache_total.items()
+            ),
+            f"# TYPE {NAME}_render_seconds_total counter",
+            *(
+                f'{NAME}_render_seconds_total{{route="{route}",phase="{phase}"}} {n}'
+                for (route, phase), n in render_seconds.items()
+            ),
+            f"# TYPE {NAME}_access_log_dropped_total counter",
+            *(
+                f'{NAME}_access_log_dropped_total{{route="{route}"}} {n}'
+                for route, n in log_dropped.items()
+            ),
+        ]
+        return "\n".join(lines) + "\n"
+
+    f_app.add_middleware(metrics_middleware)
+
+    ## early hints
+    hero_sizes = "(min-width: 768px) 33vw, 100vw"  # the home page's example ultrasound
+    profile_sizes = "240px"  # the about page's photos
+    page_hints = {  # page path -> (image, sizes) it shows above the fold
+        "/": (("example.png", hero_sizes),),
+        "/about-us": (("andrew.jpeg", profile_sizes),),
+        "/partner": (),
+        "/blog": (),
+    }
+
+    def head_links():
+        """`Link` values for the scripts and stylesheets in `head_deps`: preloads for
+        our own assets, preconnects for third-party origins.
+        """
+        links = {}  # ordered set
+        for dep in head_deps:
+            url = dep.attrs.get("src") or dep.attrs.get("href")
+            if dep.tag not in ("script", "link") or not url or dep.rel == "icon":
+                continue
+            if url.startswith("/"):
+                kind = "script" if dep.tag == "script" else "style"
+                links[f"<{url}>; rel=preload; as={kind}"] = None
+            else:
+                scheme, origin, *_ = urlsplit(url)
+                links[f"<{scheme}://{origin}>; rel=preconnect"] = None
+        return list(links)
+
+    def image_link(name, sizes):
+        """`Link` preload of the asset `name`, as its best built variants if any."""
+        for fmt, variants in image_variants(name).items():
+            if variants:
+                srcset = ", ".join(f"{url} {width}w" for width, url in variants)
+                return (
+                    f"<{variants[0][1]}>; rel=preload; as=image; "
+                    f'type={IMAGE_FORMATS[fmt][0]}; imagesrcset="{srcset}"; '
+                    f'imagesizes="{sizes}"'
+                )
+        return f"<{asset_url(name)}>; rel=preload; as=image"
+
+    # computed once, sent as the pages' `Link` header and as 103 Early Hints
+    page_links = {
+        path: [*head_links(), *(image_link(*hint) for hint in hints)]
+        for path, hints in page_hints.items()
+    }
+
+    def early_hints_middleware(app):
+        """Send a page's `page_links` as 103 Early Hints, so its critical fetches start
+        before the response, where the server supports the ASGI extension for it.
+        Only full page loads get them: htmx swaps already have the head.
+        """
+
+        async def asgi(scope, receive, send):
+            if (
+                scope["type"] == "http"
+                and scope["method"] in ("GET", "HEAD")
+                and scope["path"] in page_links
+                and not any(name == b"hx-request" for name, _ in scope["headers"])
+                and "http.response.early_hint" in scope.get("extensions", {})
+            ):
+                await send(
+                    {
+                        "type": "http.response.early_hint",
+                        "links": [link.encode() for link in page_links[scope["path"]]],
+                    }
+                )
+            return await app(scope, receive, send)
+
+        return asgi
+
+    f_app.add_middleware(early_hints_middleware)
+
     ## layout
+    github_svg = (ASSETS_PATH / "icons" / "github.svg").read_text()
+
     def nav():
         return fh.Nav(
             fh.A("home", href="/", cls="text-lg " + link_cls),
@@ -142,6 +941,11 @@ def get_app():  # noqa: C901
                 cls="text-right md:text-left grid grid-cols-2 justify-items-end md:flex gap-4 md:gap-8",
                 style="direction: rtl;",
             ),
+            hx_boost="true",  # nav links fetch only the page's <main>, see `cached_page`
+            hx_target="main",
+            hx_select="main",  # also works with full pages, e.g. from a static export
+            hx_swap="outerHTML",
+            hx_indicator="#spinner",
             cls="flex justify-between p-4 relative",
         )
 
@@ -169,9 +973,11 @@ def get_app():  # noqa: C901
                 fh.P(
                     "ETL, evaluation, and model quantization/training alongside an API and website were completed and served for under $2.",
                 ),
-                fh.Img(
-                    src="/assets/example.png",
-                    alt="Example ultrasound",
+                picture(
+                    "example.png",
+                    "Example ultrasound",
+                    sizes=hero_sizes,
+                    priority=True,
                     hx_indicator="#spinner",
                     hx_trigger="load",
                     cls="w-full object-contain",
@@ -195,11 +1001,11 @@ def get_app():  # noqa: C901
                         fh.B(fh.U("Andrew Hinh")),
                         ", a 3rd year CSEN student at SCU focusing on ML/DL. In my free time, I enjoy cooking, gaming, and rock climbing.",
                     ),
-                    fh.Img(
-                        src="/assets/andrew.jpeg",
-                        alt="Andrew's Profile Picture",
-                        hx_indicator="#spinner",
-                        hx_trigger="load",
+                    picture(
+                        "andrew.jpeg",
+                        "Andrew's Profile Picture",
+                        sizes=profile_sizes,
+                        priority=True,
                         cls="max-h-60 max-w-60 object-contain",
                     ),
                     cls="justify-between " + page_ctnt_cls,
@@ -210,11 +1016,10 @@ def get_app():  # noqa: C901
                         fh.B(fh.U("Pranav Chainani")),
                         " and I am a third-year Electrical and Computer Engineering major at Santa Clara University. My interests include circuit design, and artificial intelligence in embedded systems. I have experience as a Product Manager as I am going to embark on my third internship at Microsoft as a Product Manager Intern. My hobbies include hiking, playing basketball, and watching crime thrillers.",
                     ),
-                    fh.Img(
-                        src="/assets/pranav.jpeg",
-                        alt="Pranav's Profile Picture",
-                        hx_indicator="#spinner",
-                        hx_trigger="revealed",
+                    picture(
+                        "pranav.jpeg",
+                        "Pranav's Profile Picture",
+                        sizes=profile_sizes,
                         cls="max-h-60 max-w-60 object-contain",
                     ),
                     cls="justify-between " + page_ctnt_cls,
@@ -225,11 +1030,10 @@ def get_app():  # noqa: C901
                         fh.B(fh.U("Gigi")),
                         " and I am a Junior Electrical and Computer Engineering Major. I like to experiment with robotics and computer science, especially using Python and C. On campus, I am involved in the Society of Women Engineers (SWE), and in my free time, I like to travel, read, and spend time with friends.",
                     ),
-                    fh.Img(
-                        src="/assets/gigi.jpeg",
-                        alt="Gigi's Profile Picture",
-                        hx_indicator="#spinner",
-                        hx_trigger="revealed",
+                    picture(
+                        "gigi.jpeg",
+                        "Gigi's Profile Picture",
+                        sizes=profile_sizes,
                         cls="max-h-60 max-w-60 object-contain",
                     ),
                     cls="justify-between " + page_ctnt_cls,
@@ -240,11 +1044,10 @@ def get_app():  # noqa: C901
                         fh.B(fh.U("Anastasiia Statcenko")),
                         " and I am a junior studying Computer Science and Engineering at Santa Clara University. I enjoy working on projects that combine my passion for programming and hardware, such as building an Autonomous Whack-A-Mole Robot or SQL-like Parser Client in C++. On campus, I am involved in Acapella and Choir. Outside of academics, I love reading philosophy and writing music.",
                     ),
-                    fh.Img(
-                        src="/assets/stasiia.jpeg",
-                        alt="Stasiia's Profile Picture",
-                        hx_indicator="#spinner",
-                        hx_trigger="revealed",
+                    picture(
+                        "stasiia.jpeg",
+                        "Stasiia's Profile Picture",
+                        sizes=profile_sizes,
                         cls="max-h-60 max-w-60 object-contain",
                     ),
                     cls="justify-between " + page_ctnt_cls,
@@ -274,10 +1077,10 @@ def get_app():  # noqa: C901
                     fh.A("Fistula e.V", href="https://www.fistula.de/", cls=link_cls),
                     " which both share similar goals of improving maternal health in sub-Saharan Africa. ",
                 ),
-                fh.Iframe(
-                    src="https://www.youtube.com/embed/FpMZB5JoQJc",
-                    title="Fistula: An MHF Film",
-                    loading="lazy",
+                video_facade(
+                    "FpMZB5JoQJc",
+                    "Fistula: An MHF Film",
+                    "posters/fistula-mhf-film.svg",
                     cls="w-full h-96",
                 ),
                 cls="md:w-2/3 justify-start " + page_ctnt_cls,
@@ -287,407 +1090,179 @@ def get_app():  # noqa: C901
             cls=main_ctnr_cls,
         )
 
-    def blog_content():
-        return fh.Main(
-            fh.Div(
-                fh.P("Weekly Reports", cls="text-4xl text-center"),
-                cls="md:w-2/3 justify-center " + page_ctnt_cls,
-            ),
-            fh.Div(
-                fh.P(fh.B(fh.U("3/18/25"))),
-                fh.Ul(
-                    fh.Li("Completed final report."),
-                    fh.Li("Completed 1 slide summary."),
-                    fh.Li("Completed team evals for all team members."),
-                ),
-                fh.P(fh.B(fh.U("Andrew:"))),
-                fh.Ul(
-                    fh.Li("Completed 1 slide summary."),
-                    fh.Li(
-                        "Updated final report results and appendix section based on draft feedback."
-                    ),
-                    fh.Li("Completed individual reflection."),
-                    fh.Li(
-                        "Updated the eFolio's home and blog page with new information."
-                    ),
-                ),
-                fh.Iframe(
-                    **{
-                        "data-src": "https://docs.google.com/presentation/d/18aCpF0gqmMGF1dudODnyiuFgWfeV_EY3i1880GfrnvU/edit?usp=sharing?embedded=true"
-                    },
-                    title="Week 10 - 1 Slide Summary",
-                    loading="lazy",
-                    cls="w-full h-svh",
-                    hx_indicator="#spinner",
-                    hx_trigger="revealed",
-                ),
-                fh.Iframe(
-                    **{
-                        "data-src": "https://docs.google.com/document/d/1ZIRdNGs8wZ3k0xuu9e7ILhpco6xCXsrMKdxTFggTcro/edit?usp=sharing?embedded=true"
-                    },
-                    title="Week 10: Andrew's Reflection",
+    def picture(name, alt, sizes, cls="", priority=False, **kw):
+        """`<picture>` of the asset `name` that lets the browser pick the smallest
+        built AVIF/WebP variant covering `sizes`, with the original as fallback.
+        Only the `priority` (above the fold) image is fetched eagerly.
+        """
+        img = fh.Img(
+            src=asset_url(name),
+            alt=alt,
+            **image_attrs(name),
+            loading=None if priority else "lazy",
+            decoding="async",
+            fetchpriority="high" if priority else None,
+            cls=cls,
+            **kw,
+        )
+        sources = [
+            fh.Source(
+                type=IMAGE_FORMATS[fmt][0],
+                srcset=", ".join(f"{url} {width}w" for width, url in variants),
+                sizes=sizes,
+            )
+            for fmt, variants in image_variants(name).items()
+            if variants
+        ]
+        return fh.Picture(*sources, img, cls="contents") if sources else img
+
+    def facade(src, title, preview, frame_cls, allow=None, cls=""):
+        """Static `preview` that is swapped for the real iframe of `src` when clicked."""
+        return fh.Button(
+            *preview,
+            type="button",
+            title=title,
+            data_facade=src,
+            data_frame_cls=frame_cls,
+            data_allow=allow,
+            cls="m-0 text-left text-inherit font-normal cursor-pointer " + cls,
+        )
+
+    doc_kinds = {  # Google Drive URL path -> (label, thumbnail under assets/)
+        "document": ("Google Doc", "thumbs/document.svg"),
+        "presentation": ("Google Slides", "thumbs/presentation.svg"),
+        "spreadsheets": ("Google Sheet", "thumbs/spreadsheets.svg"),
+    }
+
+    def doc_facade(doc):
+        label, thumb = doc_kinds[doc["url"].split("/")[3]]
+        return facade(
+            doc["url"],
+            doc["title"],
+            (
+                fh.Img(
+                    src=asset_url(doc.get("thumb", thumb)),
+                    alt=label,
+                    **image_attrs(doc.get("thumb", thumb)),
                     loading="lazy",
-                    cls="w-full h-svh",
-                    hx_indicator="#spinner",
-                    hx_trigger="revealed",
-                ),
-                cls="md:w-2/3 " + page_ctnt_cls,
-            ),
-            fh.Div(
-                fh.P(fh.B(fh.U("3/11/25"))),
-                fh.Ul(
-                    fh.Li("Completed final presentation and draft of final report."),
-                    fh.Li("Updated our Gantt chart."),
+                    decoding="async",
+                    cls="w-12 h-16 object-contain",
                 ),
-                fh.P(fh.B(fh.U("Andrew:"))),
-                fh.Ul(
-                    fh.Li("Completed results sections of final presentation."),
-                    fh.Li("Completed results and appendix sections of final report."),
-                    fh.Li(
-                        "Updated the eFolio's home and blog page with new information."
+                fh.Span(  # a button only holds phrasing content, so spans throughout
+                    fh.Span(doc["title"], cls="block font-bold"),
+                    fh.Span(
+                        label + " · click to load", cls="block text-sm text-slate-400"
                     ),
-                ),
-                fh.Iframe(
-                    **{
-                        "data-src": "https://docs.google.com/presentation/d/1tbuMEgGKxdQRsnHvGZwfdjJNx-PwyOAQwCH-3cffeWo/edit?usp=sharing?embedded=true"
-                    },
-                    title="Week 9 Final Presentation",
-                    loading="lazy",
-                    cls="w-full h-svh",
-                    hx_indicator="#spinner",
-                    hx_trigger="revealed",
-                ),
-                fh.Iframe(
-                    **{
-                        "data-src": "https://docs.google.com/document/d/1JlFB8ReklXnuTDAgMZ1R-huJg36f4kV9Y9CpOZrKLmI/edit?usp=sharing?embedded=true"
-                    },
-                    title="Week 9 Final Report",
-                    loading="lazy",
-                    cls="w-full h-svh",
-                    hx_indicator="#spinner",
-                    hx_trigger="revealed",
-                ),
-                cls="md:w-2/3 " + page_ctnt_cls,
-            ),
-            fh.Div(
-                fh.P(fh.B(fh.U("3/4/25"))),
-                fh.Ul(
-                    fh.Li("Updated progress for draft of final report."),
-                    fh.Li("Completed model fine-tune and API + website."),
-                    fh.Li("Exchanged multiple emails with our community partner."),
-                    fh.Li("Met with our community partner to discuss progress."),
-                    fh.Li("Updated our Gantt chart."),
-                ),
-                fh.P(fh.B(fh.U("Andrew:"))),
-                fh.Ul(
-                    fh.Li("Completed model fine-tune and API + website."),
-                    fh.Li("Emailed partner about model training progress."),
-                    fh.Li("Led meeting with partner via code walkthrough."),
-                    fh.Li("Updated the eFolio's blog page with new information."),
+                    cls="flex flex-col gap-1",
                 ),
             ),
-            fh.Div(
-                fh.P(fh.B(fh.U("2/25/25"))),
-                fh.Ul(
-                    fh.Li("Reflected on our team's progress and our project's impact."),
-                    fh.Li("Completed initial model fine-tune and draft API + website."),
-                    fh.Li("Updated our Gantt chart."),
-                ),
-                fh.P(fh.B(fh.U("Andrew:"))),
-                fh.Ul(
-                    fh.Li("Completed initial model fine-tune and ran evaluation."),
-                    fh.Li("Emailed partner about updated evaluation metrics."),
-                    fh.Li("Updated the eFolio's blog page with new information."),
-                ),
-                fh.Iframe(
-                    **{
-                        "data-src": "https://docs.google.com/document/d/1x5yxfhsUCS8gRAXRlKIHsDldSjluekfPUSum8A4VoRA/edit?usp=sharing?embedded=true"
-                    },
-                    title="Week 7 Reflection",
+            frame_cls="w-full h-svh",
+            cls="flex items-center gap-4 w-full p-4 rounded-lg border border-zinc-700 bg-zinc-800 hover:border-blue-300",
+        )
+
+    def video_facade(video_id, title, poster, cls):
+        """YouTube player for `video_id`, behind a self-hosted `poster` and play button."""
+        return facade(
+            f"https://www.youtube-nocookie.com/embed/{video_id}?autoplay=1",
+            title,
+            (
+                fh.Img(
+                    src=asset_url(poster),
+                    alt=title,
+                    **image_attrs(poster),
                     loading="lazy",
-                    cls="w-full h-svh",
-                    hx_indicator="#spinner",
-                    hx_trigger="revealed",
+                    decoding="async",
+                    cls="w-full h-full object-cover",
                 ),
-                cls="md:w-2/3 " + page_ctnt_cls,
-            ),
-            fh.Div(
-                fh.P(fh.B(fh.U("2/18/25"))),
-                fh.Ul(
-                    fh.Li(
-                        "Emailed our community partner about the metric we've chosen to use for evaluation."
-                    ),
-                    fh.Li("Completed eFolio peer reviews."),
-                    fh.Li("Updated our Gantt chart."),
-                    fh.Li("Completed EDA and baseline evaluation."),
-                    fh.Li(
-                        "Presented on our project status to the class and our community partner."
-                    ),
-                ),
-                fh.P(fh.B(fh.U("Andrew:"))),
-                fh.Ul(
-                    fh.Li("Completed EDA and baseline evaluation of model."),
-                    fh.Li(
-                        "Emailed the metric we decided to use for evaluating the model to our community partner."
-                    ),
-                    fh.Li(
-                        "Updated the dataset, EDA, and model evaluation slides for the project status update presentation."
+                fh.Svg(
+                    fh.NotStr(
+                        '<path fill="#f00" d="M66.5 7.7c-.8-2.9-3-5.2-5.9-6C55.3.2 34 .2 34 .2S12.7.2 7.4 1.7c-2.9.8-5.1 3.1-5.9 6C0 13 0 24 0 24s0 11 1.5 16.3c.8 2.9 3 5.2 5.9 6C12.7 47.8 34 47.8 34 47.8s21.3 0 26.6-1.5c2.9-.8 5.1-3.1 5.9-6C68 35 68 24 68 24s0-11-1.5-16.3z"/>'
+                        '<path fill="#fff" d="M45 24 27 14v20"/>'
                     ),
-                    fh.Li("Updated the eFolio's blog page with new information."),
-                ),
-                fh.Iframe(
-                    **{
-                        "data-src": "https://docs.google.com/presentation/d/1_ob0-vyQvwqZDx8aDCFRiMYe7fL2NOY54j6C7P7f68k/edit?usp=sharing?embedded=true"
-                    },
-                    title="Week 6 Status Update Presentation",
-                    loading="lazy",
-                    cls="w-full h-svh",
-                    hx_indicator="#spinner",
-                    hx_trigger="revealed",
+                    viewBox="0 0 68 48",
+                    cls="absolute top-1/2 left-1/2 w-16 h-12 -translate-x-1/2 -translate-y-1/2",
                 ),
-                fh.Iframe(
-                    **{
-                        "data-src": "https://docs.google.com/document/d/1a7lgvn6qnTkRB2bDayvsGMw8nEvdTFKilLsLrnjH5q4/edit?usp=sharing?embedded=true"
-                    },
-                    title="Week 6 Metrics",
-                    loading="lazy",
-                    cls="w-full h-svh",
-                    hx_indicator="#spinner",
-                    hx_trigger="revealed",
-                ),
-                cls="md:w-2/3 " + page_ctnt_cls,
             ),
-            fh.Div(
-                fh.P(fh.B(fh.U("2/11/25"))),
-                fh.P(fh.B(fh.U("Andrew:"))),
-                fh.Ul(
-                    fh.Li("Started work on implementation of accepted solution."),
-                    fh.Li("Wrote the roadmap for the project report introduction."),
-                    fh.Li("Updated the eFolio's blog page with new information."),
-                ),
-                fh.Ul(
-                    fh.Li(
-                        "Met with our community partner to discuss ranking of proposed solutions we will use."
-                    ),
+            frame_cls=cls,
+            allow="autoplay; encrypted-media; picture-in-picture",
+            cls="relative p-0 border-0 bg-black " + cls,
+        )
+
+    posts = load_posts()
+
+    def rich_text(text):
+        """`text` with markdown-style `[label](url)` links turned into anchors."""
+        parts = re.split(r"\[([^\]]+)\]\(([^)]+)\)", text)  # text, label, url, text...
+        chunks = [parts[0]]
+        for label, url, after in zip(
+            parts[1::3], parts[2::3], parts[3::3], strict=True
+        ):
+            chunks += [fh.A(label, href=url, cls=link_cls), after]
+        return [chunk for chunk in chunks if chunk]
+
+    def bullets(items):
+        return fh.Ul(
+            *(
+                fh.Li(*rich_text(item))
+                if isinstance(item, str)
+                else fh.Li(
+                    *rich_text(item["text"]),
                     fh.Ul(
-                        fh.Li(
-                            "We settled on fine-tuning Qwen2.5-VL on the point-prediction task using our proposed dataset.",
-                            cls="list-disc list-inside",
-                        ),
-                        fh.Li(
-                            "For the implementation, he'd like us to focus on finding good metrics for evaluation, minimizing latency and memory usage, and comparing the performance of different model sizes.",
-                            cls="list-disc list-inside",
+                        *(
+                            fh.Li(*rich_text(sub), cls="list-disc list-inside")
+                            for sub in item["items"]
                         ),
                         cls="flex flex-col gap-1 p-2",
                     ),
-                    fh.Li(
-                        "Scheduled a meeting with our community partner to check in on our implementation progress."
-                    ),
-                    fh.Li("Updated our Gantt chart."),
-                    fh.Li("Wrote the introduction for our project report."),
-                ),
-                fh.Iframe(
-                    **{
-                        "data-src": "https://docs.google.com/document/d/1099_lKw-ioY0NKNFFzv7Kf-yvIcjKzkDrbEGmVqU6fA/edit?usp=sharing?embedded=true"
-                    },
-                    title="Week 5 Project Report Introduction",
-                    loading="lazy",
-                    cls="w-full h-svh",
-                    hx_indicator="#spinner",
-                    hx_trigger="revealed",
-                ),
-                cls="md:w-2/3 " + page_ctnt_cls,
-            ),
-            fh.Div(
-                fh.P(fh.B(fh.U("2/4/25"))),
-                fh.P(fh.B(fh.U("Andrew:"))),
-                fh.Ul(
-                    fh.Li(
-                        "Researched majority of solutions to propose to our community partner."
-                    ),
-                    fh.Li("Revised team contract."),
-                    fh.Li("Revised and added thoughts to team reflection."),
-                    fh.Li("Updated the eFolio's blog page with new information."),
-                ),
-                fh.Ul(
-                    fh.Li(
-                        "Met with our community partner to discuss ranking of proposed datasets we will use. Below is the summary:",
-                        fh.Ul(
-                            fh.Li(
-                                "Mahni agreed with our ranking, and proposed his own dataset which we initially rejected due to the lack of segmentation labels. However, he now says these labels are not necessarily required.",
-                                cls="list-disc list-inside",
-                            ),
-                            cls="flex flex-col gap-1 p-2",
-                        ),
-                    ),
-                    fh.Li(
-                        "Scheduled a meeting with our community partner to discuss proposed solutions for the project."
-                    ),
-                    fh.Li("Researched solutions to propose to our community partner."),
-                    fh.Li("Updated our Gantt chart."),
-                    fh.Li("Reflected on our team's progress and our project's impact."),
-                ),
-                fh.Iframe(
-                    **{
-                        "data-src": "https://docs.google.com/document/d/1QKPghn7ofOXiDgwf9LgjZudIWcZalDaYbgZFZymEgaU/edit?usp=sharing?embedded=true"
-                    },
-                    title="Week 4 Solution Proposal",
-                    loading="lazy",
-                    cls="w-full h-svh",
-                    hx_indicator="#spinner",
-                    hx_trigger="revealed",
-                ),
-                fh.Iframe(
-                    **{
-                        "data-src": "https://docs.google.com/document/d/1mfdwgn7euTwjL1cV9o15PlTjvGGw1HAhCUs9rCUpKAk/edit?usp=sharing?embedded=true"
-                    },
-                    title="Week 4 Design Review",
-                    loading="lazy",
-                    cls="w-full h-svh",
-                    hx_indicator="#spinner",
-                    hx_trigger="revealed",
-                ),
-                cls="md:w-2/3 " + page_ctnt_cls,
+                )
+                for item in items
+            )
+        )
+
+    def blog_post(post):
+        date = post["date"]
+        return fh.Div(
+            fh.P(fh.B(fh.U(f"{date.month}/{date.day}/{date:%y}"))),
+            *(fh.P(*rich_text(note)) for note in post.get("notes", [])),
+            *([bullets(post["team"])] if "team" in post else []),
+            *(
+                part
+                for member, items in post.get("members", {}).items()
+                for part in (fh.P(fh.B(fh.U(f"{member}:"))), bullets(items))
             ),
-            fh.Div(
-                fh.P(fh.B(fh.U("1/28/25"))),
-                fh.P(fh.B(fh.U("Andrew:"))),
-                fh.Ul(
-                    fh.Li(
-                        "Researched datasets to propose to our community partner, including ",
-                        fh.A(
-                            "this dataset",
-                            href="https://www.nature.com/articles/s41597-024-03774-3",
-                            cls=link_cls,
-                        ),
-                        " which we will proceed with for the project.",
-                    ),
-                    fh.Li("Updated the eFolio's blog page with new information."),
-                ),
-                fh.Ul(
-                    fh.Li(
-                        "Came up with the following problem statement:",
-                        fh.Ul(
-                            fh.Li(
-                                "MHF’s Chief AI Officer needs a potential automated solution to suggest labels for ultrasound images because of the time and monetary cost of manual labor.",
-                                cls="list-disc list-inside",
-                            ),
-                            cls="flex flex-col gap-1 p-2",
-                        ),
-                    ),
-                    fh.Li(
-                        "Scheduled a meeting with our community partner to discuss proposed datasets we will use. Below is the summary:"
-                    ),
-                    fh.Li("Researched datasets to propose to our community partner."),
-                    fh.Li("Revised our Gantt chart to include more details."),
-                    fh.Li("Created a team contract."),
-                    fh.Li(
-                        "Met with our community partner to discuss proposed datasets we will use. Below is the summary:",
-                        fh.Ul(
-                            fh.Li(
-                                "Before team meeting sunday, look over your and others' datasets and rank which ones you think we should use. We’ll discuss it sunday and move forward with the top dataset to create a proposal for him for our meeting next week.",
-                                cls="list-disc list-inside",
-                            ),
-                            cls="flex flex-col gap-1 p-2",
-                        ),
-                    ),
-                    fh.Li(
-                        "Scheduled another meeting with our community partner to discuss ranking of proposed datasets."
-                    ),
-                ),
-                fh.Iframe(
-                    **{
-                        "data-src": "https://docs.google.com/document/d/1wMQcTuM_cb2Ur1VsG8rVsLqLigFYQLwoaBg-8dgU9Nk/edit?usp=drive_link?embedded=true"
-                    },
-                    title="Week 3 Dataset Proposal",
-                    loading="lazy",
-                    cls="w-full h-svh",
-                    hx_indicator="#spinner",
-                    hx_trigger="revealed",
-                ),
-                fh.Iframe(
-                    **{
-                        "data-src": "https://docs.google.com/spreadsheets/d/1xF2eMSg26GFkbdGwVVUvcIv7fqNWWWDsGyeHeZoppdU/edit?usp=drive_link?embedded=true"
-                    },
-                    title="Week 3 Gantt Chart",
-                    loading="lazy",
-                    cls="w-full h-svh",
-                    hx_indicator="#spinner",
-                    hx_trigger="revealed",
-                ),
-                fh.Iframe(
-                    **{
-                        "data-src": "https://docs.google.com/document/d/1KObr86ITkrr6Qc9P0LxuaFamLGa7eYNdOq9UDD2aIAI/edit?usp=drive_link?embedded=true"
-                    },
-                    title="Week 3 Team Contract",
-                    loading="lazy",
-                    cls="w-full h-svh",
-                    hx_indicator="#spinner",
+            *(doc_facade(doc) for doc in post.get("docs", [])),
+            cls="md:w-2/3 " + page_ctnt_cls,
+        )
+
+    def blog_posts(page):
+        """Reports on `page`, then a trigger that loads the next page when revealed."""
+        start = (page - 1) * BLOG_PAGE_SIZE
+        items = [blog_post(post) for post in posts[start : start + BLOG_PAGE_SIZE]]
+        if start + BLOG_PAGE_SIZE < len(posts):
+            items.append(
+                fh.Div(
+                    hx_get=f"/blog/page/{page + 1}",
                     hx_trigger="revealed",
-                ),
-                cls="md:w-2/3 " + page_ctnt_cls,
-            ),
-            fh.Div(
-                fh.P(fh.B(fh.U("1/21/25"))),
-                fh.P(fh.B(fh.U("Andrew:"))),
-                fh.Ul(
-                    fh.Li(
-                        "Researched a few datasets before the meeting with our community partner."
-                    ),
-                    fh.Li(
-                        "Updated the eFolio to add the partner page, and updated the About us and project pages with new information."
-                    ),
-                    fh.Li(
-                        "Created a new GH repo for all of our work we will share with our community partner."
-                    ),
-                    fh.Li(
-                        "Gave initial draft for distributing phases amongst team members."
-                    ),
-                ),
-                fh.Ul(
-                    fh.Li(
-                        "Scheduled a meeting with our community partner, and drafted questions and curated datasets in preparation."
-                    ),
-                    fh.Li(
-                        "Met with our community partner and collected extensive notes."
-                    ),
-                    fh.Li("Estimated our project timeline by creating a Gantt chart."),
-                    fh.Li(
-                        "Created a new GH repo for all of our work we will share with our community partner."
-                    ),
-                    fh.Li(
-                        "Scheduled another meeting with our community partner to discuss the project timeline and next steps."
-                    ),
-                ),
-                fh.Iframe(
-                    **{
-                        "data-src": "https://docs.google.com/document/d/1UrzQ3rnxGRUNtGPX4nH8FHaKZ-VpXASbr3uJJ8OQVZw/edit?usp=drive_link?embedded=true"
-                    },
-                    title="Week 2 Team Activities and Documentation",
-                    loading="lazy",
-                    cls="w-full h-svh",
+                    hx_swap="outerHTML",
                     hx_indicator="#spinner",
-                    hx_trigger="revealed",
-                ),
-                cls="md:w-2/3 " + page_ctnt_cls,
-            ),
+                )
+            )
+        return items
+
+    def render_posts(page):
+        """HTML for the reports on `page`, for infinite scroll to append."""
+        with timed("build"):
+            items = tuple(blog_posts(page))
+        with timed("serialize"):
+            return fh.to_xml(items, indent=False)
+
+    def blog_content():
+        return fh.Main(
             fh.Div(
-                fh.P(fh.B(fh.U("1/14/25"))),
-                fh.P(
-                    "This is my first choice partner because I really enjoy working on AI, especially when applied to healthcare."
-                ),
-                fh.Iframe(
-                    **{
-                        "data-src": "https://docs.google.com/document/d/14YZgGb4Hw2yzWcnKXt-fEAJYrAUGvkSgd10AhLYwkW4/edit?usp=drive_link?embedded=true"
-                    },
-                    title="Andrew's CP Research",
-                    loading="lazy",
-                    cls="max-w-60 max-h-60 object-contain",
-                    hx_indicator="#spinner",
-                    hx_trigger="revealed",
-                ),
-                cls="md:w-2/3 " + page_ctnt_cls,
+                fh.P("Weekly Reports", cls="text-4xl text-center"),
+                cls="md:w-2/3 justify-center " + page_ctnt_cls,
             ),
+            *blog_posts(1),
             cls=main_ctnr_cls,
         )
 
@@ -698,9 +1273,7 @@ def get_app():  # noqa: C901
         return fh.Footer(
             fh.A(
                 fh.Svg(
-                    fh.NotStr(
-                        si_github.svg,
-                    ),
+                    fh.NotStr(github_svg),
                     cls="w-8 h-8 text-blue-300 hover:text-blue-100 cursor-pointer",
                 ),
                 href="https://github.com/andrewhinh/mhf",
@@ -719,96 +1292,250 @@ def get_app():  # noqa: C901
         )
 
     # routes
+    ## shared-cache policy, so a CDN in front of Modal absorbs most requests
+    cache_policy = {  # response kind -> Cache-Control; browsers revalidate by ETag
+        "page": "public, max-age=0, s-maxage=300, stale-while-revalidate=86400, stale-if-error=604800",
+        "not-found": "public, max-age=0, s-maxage=60, stale-while-revalidate=600",
+        "asset": "public, max-age=0, s-maxage=3600, stale-while-revalidate=86400, stale-if-error=604800",
+        "hashed": IMMUTABLE_CACHE_CONTROL,  # a new version is a new URL
+    }
+    # the CDN's (or a local proxy's) purge API and the token guarding /purge
+    purge_url = os.environ.get("PURGE_URL")
+    purge_token = os.environ.get("PURGE_TOKEN")
+
     ## for images, CSS, etc.
-    @f_app.get("/{fname:path}.{ext:static}")
-    def static_files(fname: str, ext: str):
-        static_file_path = PARENT_PATH / "assets" / f"{fname}.{ext}"
-        print(static_file_path, static_file_path.exists())
-        if static_file_path.exists():
-            return fh.FileResponse(static_file_path)
+    asset_store = load_assets()
+    asset_variants = {}  # url -> encoded variants, filled on first hit
+
+    ## service worker, whose cache is versioned by everything a response comes from
+    build_version = hashlib.blake2b(
+        Path(__file__).read_bytes()
+        + "".join(ASSET_MANIFEST.values()).encode()
+        + b"".join(path.read_bytes() for path in sorted(BLOG_PATH.glob("*.toml"))),
+        digest_size=4,
+    ).hexdigest()
+    precache = [  # the page shells and what they load; photos are cached when shown
+        *page_links,
+        *(
+            url
+            for name, url in ASSET_MANIFEST.items()
+            if not name.startswith("img/")
+            and name not in IMAGE_SOURCES
+            and name != "styles.css"  # already inlined into every page
+        ),
+    ]
+    asset_store["/sw.js"] = (
+        (
+            f"const CACHE = {json.dumps(f'{NAME}-{build_version}')};\n"
+            f"const PRECACHE = {json.dumps(precache)};\n" + SERVICE_WORKER_JS
+        ).encode(),
+        {"Content-Type": "text/javascript"},
+    )
+    hashed_names = {url: name for name, url in ASSET_MANIFEST.items()}
+    for url, (_, headers) in asset_store.items():
+        if url in hashed_names:
+            name, policy = hashed_names[url], "hashed"
+        else:  # /assets/<name> or /<name>
+            name, policy = url.removeprefix("/").removeprefix("assets/"), "asset"
+        headers["Cache-Control"] = cache_policy[policy]
+        headers["Surrogate-Key"] = f"asset:{name} assets"
+
+    asset_route = "/{fname:path}.{ext:static}"
+
+    @f_app.get(asset_route)
+    async def static_files(req, fname: str, ext: str):
+        url = f"/{fname}.{ext}"
+        if url not in asset_variants:
+            if url not in asset_store:
+                return fh.Response(
+                    "404 Not Found",
+                    status_code=404,
+                    media_type="text/plain",
+                    headers={"Cache-Control": cache_policy["not-found"]},
+                )
+            note_cache(False)
+            # compressing is CPU-bound, so it runs once per URL off the event loop
+            asset_variants[url] = await run_in_threadpool(
+                encode_variants, *asset_store[url]
+            )
+        else:
+            note_cache(True)
+        return serve_variants(req, asset_variants[url])
+
+    @f_app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return fh.Response(
+            render_metrics(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+            headers={"Cache-Control": "no-store"},
+        )
+
+    ## invalidating the CDN after a deploy, see `purge_changed`
+    @f_app.post("/purge", include_in_schema=False)
+    async def purge(req, keys: str = "pages assets"):
+        """Forward a purge of the surrogate `keys` to `PURGE_URL`."""
+        if not purge_token:
+            raise fh.HTTPException(404)
+        expected = f"Bearer {purge_token}".encode()
+        if not hmac.compare_digest(
+            req.headers.get("authorization", "").encode(), expected
+        ):
+            return fh.Response(
+                "401 Unauthorized",
+                status_code=401,
+                media_type="text/plain",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        forwarded = None
+        if purge_url:
+            async with httpx.AsyncClient() as client:
+                resp = await client.request(
+                    "PURGE", purge_url, headers={"Surrogate-Key": keys}
+                )
+            forwarded = resp.status_code
+        return fh.JSONResponse(
+            {"keys": keys.split(), "forwarded": forwarded},
+            headers={"Cache-Control": "no-store"},
+        )
 
     ## toasts without target
+    max_toast_length = 200  # characters, as toasts end up in the session cookie
+    toast_types = ("info", "success", "warning", "error")  # what fasthtml renders
+
     @f_app.post("/toast")
-    def toast(session, message: str, type: str):
+    async def toast(session, message: str, type: str):
+        if len(message) > max_toast_length or type not in toast_types:
+            return fh.Response(
+                "422 Unprocessable Entity", status_code=422, media_type="text/plain"
+            )
         fh.add_toast(session, message, type)
         return toast_container()
 
     ## pages
-    @f_app.get("/")
-    def home(
-        session,
-    ):
-        return (
-            fh.Title(NAME),
-            fh.Div(
-                nav(),
-                home_content(),
-                toast_container(),
-                footer(),
-                cls=page_cls,
-            ),
+    page_cache = {}  # (name, fragment) or (name, page) -> encoded variants
+    page_templates = {}  # same keys -> compiled template, for filling slots
+
+    def render_page(page, fragment=False):
+        """HTML for `page()` with the shared `head_deps`, and a "toasts" slot for
+        `fill_template`.
+
+        A fragment is only the title and `<main>`, for boosted nav links to swap in.
+        """
+        with timed("build"):
+            title, content = page()
+            if fragment:
+                ft = (title, content, slot("toasts"))
+            else:
+                head = fh.Head(title, *head_deps)
+                body = fh.Body(
+                    fh.Div(nav(), content, toast_container(), footer(), cls=page_cls),
+                    slot("toasts"),
+                    *f_app.ftrs,
+                    **f_app.bodykw,
+                )
+                ft = fh.Html(head, body, **f_app.htmlkw)
+        with timed("serialize"):
+            html = fh.to_xml(ft, indent=False)
+        return html if fragment else "<!doctype html>" + html
+
+    async def cached_html(req, key, render, status_code=200, slots=None, links=None):
+        """Serve the HTML from `render()` out of the render cache, rendering on first hit.
+
+        With `slots` (name -> bytes), those are spliced into the cached template and
+        the response is private, since slots hold per-session markup. `links` are
+        sent as the `Link` header.
+        """
+        headers = {
+            "Content-Type": "text/html; charset=utf-8",
+            "Vary": "HX-Request, HX-History-Restore-Request",
+            "Cache-Control": cache_policy[
+                "not-found" if status_code == 404 else "page"
+            ],
+            "Surrogate-Key": f"page:{key[0]} pages",
+        }
+        if links:
+            headers["Link"] = ", ".join(links)
+
+        def compile_page():
+            template = compile_template(render())
+            return template, encode_variants(fill_template(template, {}), headers)
+
+        note_cache(key in page_cache)
+        if key not in page_cache:  # rendering and compressing run off the event loop
+            page_templates[key], page_cache[key] = await run_in_threadpool(compile_page)
+        if slots:
+            return fh.Response(
+                fill_template(page_templates[key], slots),
+                status_code=status_code,
+                headers={**headers, "Cache-Control": "private, no-store"},
+            )
+        return serve_variants(req, page_cache[key], status_code)
+
+    async def cached_page(req, name, page, status_code=200):
+        """Serve `page()` from the render cache, rendering its HTML on first hit."""
+        # htmx restores history misses into <body>, so those get the full page
+        fragment = (
+            "hx-request" in req.headers
+            and "hx-history-restore-request" not in req.headers
+        )
+        # prefetches (ours or the browser's) are served straight from the cache,
+        # leaving pending toasts for the visit itself
+        purpose = req.headers.get("sec-purpose") or req.headers.get("purpose") or ""
+        prefetch = "prefetch" in purpose
+        session = req.scope.get("session", {})
+        slots = None
+        if fh.sk in session and not prefetch:  # pending toasts are per-session
+            slots = {
+                "toasts": fh.to_xml(fh.render_toasts(session), indent=False).encode()
+            }
+        resp = await cached_html(
+            req,
+            (name, fragment),
+            lambda: render_page(page, fragment),
+            status_code,
+            slots,
+            None if fragment else page_links.get(req.url.path),
         )
+        if prefetch:
+            resp.headers["Cache-Control"] = PREFETCH_CACHE_CONTROL
+        return resp
+
+    def home_page():
+        return fh.Title(NAME), home_content()
+
+    def about_us_page():
+        return fh.Title(NAME + " | " + "about us"), about_content()
+
+    def partner_page():
+        return fh.Title(NAME + " | " + "partner"), partner_content()
+
+    def blog_page():
+        return fh.Title(NAME + " | " + "blog"), blog_content()
+
+    @f_app.get("/")
+    async def home(req):
+        return await cached_page(req, "home", home_page)
 
     @f_app.get("/about-us")
-    def about_us(
-        session,
-    ):
-        return (
-            fh.Title(NAME + " | " + "about us"),
-            fh.Div(
-                nav(),
-                about_content(),
-                toast_container(),
-                footer(),
-                cls=page_cls,
-            ),
-        )
+    async def about_us(req):
+        return await cached_page(req, "about-us", about_us_page)
 
     @f_app.get("/partner")
-    def partner(
-        session,
-    ):
-        return (
-            fh.Title(NAME + " | " + "partner"),
-            fh.Div(
-                nav(),
-                partner_content(),
-                toast_container(),
-                footer(),
-                cls=page_cls,
-            ),
-        )
+    async def partner(req):
+        return await cached_page(req, "partner", partner_page)
 
     @f_app.get("/blog")
-    def blog(session):
-        return (
-            fh.Title(NAME + " | " + "blog"),
-            fh.Div(
-                nav(),
-                blog_content(),
-                toast_container(),
-                footer(),
-                cls=page_cls,
-            ),
-            fh.Script(
-                """
-document.addEventListener("DOMContentLoaded", function() {
-    const lazyIframes = document.querySelectorAll("iframe[data-src]");
-    const iframeObserver = new IntersectionObserver((entries, observer) => {
-        entries.forEach(entry => {
-            if (entry.isIntersecting) {
-                const iframe = entry.target;
-                iframe.src = iframe.getAttribute("data-src");
-                observer.unobserve(iframe);
-            }
-        });
-    });
-    lazyIframes.forEach(iframe => {
-        iframeObserver.observe(iframe);
-    });
-});
-"""
-            ),
+    async def blog(req):
+        return await cached_page(req, "blog", blog_page)
+
+    @f_app.get("/blog/page/{page}")
+    async def blog_older(req, page: int):
+        if not 1 < page <= -(-len(posts) // BLOG_PAGE_SIZE):
+            raise fh.HTTPException(404)
+        return await cached_html(
+            req,
+            ("blog", page),
+            lambda: render_posts(page),
         )
 
     return f_app
@@ -816,18 +1543,404 @@ document.addEventListener("DOMContentLoaded", function() {
 
 f_app = get_app()
 
+# -----------------------------------------------------------------------------
+
+# Build
+# (modules only these commands need are imported inside them, off the cold start)
+
+
+def tailwind(sources: list[Path], output: Path):
+    """Compile a minified stylesheet with only the Tailwind classes used in `sources`."""
+    import subprocess
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_css = Path(tmp) / "input.css"
+        input_css.write_text(
+            TAILWIND_IMPORTS + "".join(f'@source "{src}";\n' for src in sources)
+        )
+        subprocess.run(  # noqa: S603
+            [sys.executable, "-m", "tailwindcss_bin", "-i", input_css, "-o", output]
+            + ["--minify", "--silent"],
+            check=True,
+        )
+
+
+def page_paths() -> list[str]:
+    """Paths of the app's GET pages, i.e. routes that take no parameters and are in
+    the schema.
+    """
+    return [
+        route.path
+        for route in f_app.routes
+        if "GET" in (getattr(route, "methods", None) or ())
+        and "{" not in route.path
+        and route.include_in_schema
+    ]
+
+
+def build_css():
+    """Write `assets/styles.css`, the stylesheet every page inlines in `<head>`."""
+    tailwind([PARENT_PATH / "app.py"], ASSETS_PATH / "styles.css")
+
+
+def export_site(dist: Path = DIST_PATH):
+    """Write every page and asset to `dist`, for hosting without a Python process.
+
+    Pages are crawled from the app's routes, following `hx-get` links to their
+    fragments (e.g. older blog pages), and written as `<path>/index.html` with the
+    404 page as `404.html`. Assets are written under their fingerprinted URLs. Each
+    compressible file gets `.br` and `.gz` siblings, and `manifest.json` maps every
+    URL to its file and response headers.
+    """
+    import shutil
+
+    from starlette.testclient import TestClient
+
+    client = TestClient(f_app)
+    shutil.rmtree(dist, ignore_errors=True)
+    manifest = {}
+
+    def write(url, fname, body, headers):
+        variants = encode_variants(body, headers)
+        for encoding, (data, _) in variants.items():
+            suffix = {"identity": "", "br": ".br", "gzip": ".gz"}[encoding]
+            path = dist / (fname + suffix)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(data)
+        manifest[url] = {
+            "file": fname,
+            "encodings": [enc for enc in ENCODINGS if enc in variants],
+            "headers": {k: v for k, v in headers.items() if k != "Vary"},
+        }
+
+    html_headers = {
+        "Content-Type": "text/html; charset=utf-8",
+        "Cache-Control": "no-cache",
+    }
+    pending, seen = [*page_paths(), "/404"], set()
+    while pending:
+        path = pending.pop(0)
+        if path in seen:
+            continue
+        seen.add(path)
+        resp = client.get(path, headers={"Accept-Encoding": "identity"})
+        fname = "404.html" if path == "/404" else f"{path.strip('/')}/index.html"
+        write(
+            path,
+            fname.lstrip("/"),
+            resp.content,
+            {**html_headers, "ETag": resp.headers["ETag"]},
+        )
+        pending += re.findall(r'hx-get="(/[^"]*)"', resp.text)
+
+    for url, (body, headers) in load_assets().items():
+        if headers["Cache-Control"] == IMMUTABLE_CACHE_CONTROL:  # the hashed URLs
+            write(url, url.lstrip("/"), body, {**headers, "ETag": etag_for(body)})
+    resp = client.get("/sw.js", headers={"Accept-Encoding": "identity"})
+    write(
+        "/sw.js",
+        "sw.js",
+        resp.content,
+        {k: resp.headers[k] for k in ("Content-Type", "Cache-Control", "ETag")},
+    )
+    (dist / "manifest.json").write_text(json.dumps(manifest, indent=2))
+
+
+def build_images(assets_path: Path = ASSETS_PATH):
+    """Write width-stepped AVIF and WebP variants of `IMAGE_SOURCES`, and a tiny
+    WebP placeholder of each, to `assets/img/`.
+    """
+    from PIL import Image, ImageFilter
+
+    out = assets_path / "img"
+    out.mkdir(exist_ok=True)
+    for name in IMAGE_SOURCES:
+        stem = Path(name).stem
+        with Image.open(assets_path / name) as img:
+            img.load()
+            widths = {w for w in IMAGE_WIDTHS if w < img.width} | {img.width}
+            for width in [*sorted(widths), IMAGE_PLACEHOLDER_WIDTH]:
+                height = round(img.height * width / img.width)
+                resized = img.resize((width, height), Image.Resampling.LANCZOS)
+                if width == IMAGE_PLACEHOLDER_WIDTH:  # blurred, inlined by the index
+                    resized = resized.filter(ImageFilter.GaussianBlur(1))
+                    resized.save(out / f"{stem}-lqip.webp", quality=30)
+                    continue
+                for fmt, (_, quality) in IMAGE_FORMATS.items():
+                    resized.save(out / f"{stem}-{width}.{fmt}", quality=quality)
+
+
+def vendor_js():
+    """Bundle `VENDOR_SCRIPTS` into `assets/vendor/bundle.js`, so pages self-host them."""
+    import urllib.request
+
+    sources = []
+    for url in VENDOR_SCRIPTS:
+        with urllib.request.urlopen(url) as resp:  # noqa: S310
+            sources.append(resp.read().decode())
+    (ASSETS_PATH / "vendor").mkdir(exist_ok=True)
+    (ASSETS_PATH / "vendor" / "bundle.js").write_text(";\n".join(sources))
+
+
+def vendor_css():
+    """Copy `PICO_CSS` into `assets/vendor/pico.min.css`, so pages self-host it."""
+    import urllib.request
+
+    with urllib.request.urlopen(PICO_CSS) as resp:  # noqa: S310
+        css = resp.read()
+    (ASSETS_PATH / "vendor").mkdir(exist_ok=True)
+    (ASSETS_PATH / "vendor" / "pico.min.css").write_bytes(css)
+
+
+def vendor_icons():
+    """Copy the icons the pages inline into `assets/icons/`, so `simpleicons` stays
+    out of the runtime image.
+    """
+    from simpleicons.icons import si_github
+
+    (ASSETS_PATH / "icons").mkdir(exist_ok=True)
+    (ASSETS_PATH / "icons" / "github.svg").write_text(si_github.svg)
+
+
+def warm_caches():
+    """Render and encode every page and asset ahead of the first request."""
+    from starlette.testclient import TestClient
+
+    client = TestClient(f_app)
+    stream, f_app.state.access_log = f_app.state.access_log, None  # not traffic
+    for path in [*page_paths(), "/404", *ASSET_MANIFEST.values()]:
+        client.get(path)
+    f_app.state.access_log = stream
+
+
+def purge_changed(site: str):
+    """Purge every surrogate key whose response at `site` differs from this build's,
+    through the site's `/purge` endpoint (authenticated with `PURGE_TOKEN`).
+    """
+    from starlette.testclient import TestClient
+
+    client = TestClient(f_app)
+    identity = {"Accept-Encoding": "identity"}  # so the ETags are comparable
+    keys = set()
+
+    def compare(path):
+        local = client.get(path, headers=identity)
+        remote = httpx.get(site.rstrip("/") + path, headers=identity)
+        if remote.headers.get("ETag") != local.headers["ETag"]:
+            keys.add(local.headers["Surrogate-Key"].split()[0])
+        return local
+
+    # pages are crawled like in `export_site`, so fragments (e.g. older blog pages)
+    # are compared too
+    pending, seen = [*page_paths(), "/404"], set()
+    while pending:
+        path = pending.pop(0)
+        if path in seen:
+            continue
+        seen.add(path)
+        pending += re.findall(r'hx-get="(/[^"]*)"', compare(path).text)
+    for path in ["/sw.js", *(f"/assets/{n}" for n in ASSET_MANIFEST)]:
+        compare(path)
+    if not keys:
+        print("nothing changed")
+        return
+    resp = httpx.post(
+        site.rstrip("/") + "/purge",
+        data={"keys": " ".join(sorted(keys))},
+        headers={"Authorization": f"Bearer {os.environ['PURGE_TOKEN']}"},
+    )
+    resp.raise_for_status()
+    print(resp.json())
+
+
+def bench_startup(runs: int = 5):
+    """Print the median import and first-response times of fresh interpreters."""
+    import statistics
+    import subprocess
+
+    script = """
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+from starlette.testclient import TestClient
+client = TestClient(app.f_app)
+ready = time.perf_counter()
+client.get("/")
+done = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1e3, "first_response_ms": (done - ready) * 1e3}))
+"""
+    results = [
+        json.loads(
+            subprocess.run(  # noqa: S603
+                [sys.executable, "-c", script],
+                cwd=PARENT_PATH,
+                capture_output=True,
+                check=True,
+                text=True,
+            ).stdout
+        )
+        for _ in range(runs)
+    ]
+    print(
+        json.dumps(
+            {
+                key: round(statistics.median(r[key] for r in results), 1)
+                for key in results[0]
+            }
+        )
+    )
+
+
+def bench_routes(
+    concurrency: tuple[int, ...] = (1, 16, 64),
+    requests: int = 500,
+    out: Path | None = None,
+    baseline: Path | None = None,
+):
+    """Load-test every route in-process over ASGI and print the results as JSON.
+
+    Each case sends `requests` requests at every `concurrency` level and reports
+    throughput, p50/p95/p99 latency, the status mix, mean bytes on the wire and KiB
+    allocated per request (from a separate sequential pass under tracemalloc).
+    Results are written to `out` if given, and compared against the results stored
+    at `baseline`.
+    """
+    import asyncio
+    import itertools
+    import tracemalloc
+
+    # still logging, so its cost is measured, but not over the results
+    f_app.state.access_log = open(os.devnull, "w")
+    f_app.state.proxy_hops = 1  # writes are told apart by X-Forwarded-For
+    browser = {"Accept-Encoding": "br, gzip"}
+    pages = {
+        "home": "/",
+        "about-us": "/about-us",
+        "partner": "/partner",
+        "blog": "/blog",
+    }
+    cases = {  # name -> (method, path, headers, form data)
+        **{name: ("GET", path, browser, None) for name, path in pages.items()},
+        **{
+            f"{name} (htmx)": ("GET", path, {**browser, "HX-Request": "true"}, None)
+            for name, path in pages.items()
+        },
+        "blog page 2": ("GET", "/blog/page/2", {**browser, "HX-Request": "true"}, None),
+        "asset": ("GET", asset_url("example.png"), browser, None),  # the home photo
+        "404 page": ("GET", "/missing", browser, None),
+        "404 file": ("GET", "/missing.php", browser, None),
+        "toast": ("POST", "/toast", browser, {"message": "hi", "type": "info"}),
+        "toast (flood)": (
+            "POST",
+            "/toast",
+            {**browser, "X-Forwarded-For": "10.0.0.1"},  # one client, so mostly 429s
+            {"message": "hi", "type": "info"},
+        ),
+    }
+    clients = itertools.count()  # other writes each come from a new client
+
+    def with_client(method, headers):
+        if method == "GET" or "X-Forwarded-For" in headers:
+            return headers
+        return {**headers, "X-Forwarded-For": f"10.1.{next(clients)}"}
+
+    def compared(stats, old):
+        """`stats` with the % change from `old` after each metric."""
+        return {
+            key: f"{value} ({(value / old[key] - 1) * 100:+.1f}%)"
+            if key != "status" and old.get(key)
+            else value
+            for key, value in stats.items()
+        }
+
+    def percentile(latencies, p):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))]
+
+    async def run(method, path, headers, data, level):
+        if "X-Forwarded-For" in headers:  # the flood starts each level on a full bucket
+            headers = {**headers, "X-Forwarded-For": f"10.0.{next(clients)}"}
+        transport = httpx.ASGITransport(app=f_app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as c:
+            await c.request(  # warm up
+                method, path, headers=with_client(method, headers), data=data
+            )
+            latencies, statuses, sizes = [], Counter(), []
+
+            async def worker(n):
+                for _ in range(n):
+                    start = time.perf_counter()
+                    resp = await c.request(
+                        method, path, headers=with_client(method, headers), data=data
+                    )
+                    latencies.append(time.perf_counter() - start)
+                    statuses[str(resp.status_code)] += 1
+                    sizes.append(resp.num_bytes_downloaded)
+
+            start = time.perf_counter()
+            # at least one each, so levels above `requests` still measure something
+            per_worker = max(1, requests // level)
+            await asyncio.gather(*(worker(per_worker) for _ in range(level)))
+            elapsed = time.perf_counter() - start
+            latencies.sort()
+            tracemalloc.start()
+            allocated = 0
+            for _ in range(20):
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+                await c.request(
+                    method, path, headers=with_client(method, headers), data=data
+                )
+                allocated += tracemalloc.get_traced_memory()[1] - base
+            tracemalloc.stop()
+        return {
+            "status": dict(sorted(statuses.items())),  # of the measured requests
+            "rps": round(len(latencies) / elapsed, 1),
+            **{
+                f"p{p}_ms": round(percentile(latencies, p) * 1e3, 3)
+                for p in (50, 95, 99)
+            },
+            "bytes": round(sum(sizes) / len(sizes)),
+            "alloc_kib": round(allocated / 20 / 1024, 1),
+        }
+
+    results = {
+        name: {str(level): asyncio.run(run(*case, level)) for level in concurrency}
+        for name, case in cases.items()
+    }
+    if out:
+        out.write_text(json.dumps(results, indent=2))
+    if baseline:
+        base = json.loads(baseline.read_text())
+        results = {
+            name: {
+                level: compared(stats, base.get(name, {}).get(level, {}))
+                for level, stats in levels.items()
+            }
+            for name, levels in results.items()
+        }
+    print(json.dumps(results, indent=2))
+
+
 # -----------------------------------------------------------------------------
 
 # Modal
 PYTHON_VERSION = "3.12"
 IMAGE = (
     modal.Image.debian_slim(python_version=PYTHON_VERSION)
-    .pip_install(  # add Python dependencies
+    .pip_install(  # add Python dependencies, runtime only
+        "brotli>=1.1.0",
         "python-fasthtml>=0.12.0",
-        "simpleicons>=7.21.0",
         "sqlite-minutils>=4.0.3",
     )
     .add_local_dir(PARENT_PATH / "assets", "/root/assets", copy=True)
+    .add_local_dir(BLOG_PATH, "/root/blog", copy=True)
+    .run_function(vendor_js, include_source=True)
+    .run_function(vendor_css, include_source=True)
+    .pip_install("pillow>=11.3.0")  # for build_images only
+    .run_function(build_images, include_source=True)
+    .run_commands("pip uninstall -y pillow")  # so the runtime keeps to its deps
 )
 MINUTES = 60  # seconds
 FE_TIMEOUT = 5 * MINUTES
@@ -835,7 +1948,10 @@ FE_SCALEDOWN_WINDOW = 1 * MINUTES
 FE_ALLOW_CONCURRENT_INPUTS = 1000  # max
 
 APP_NAME = f"{NAME}-frontend"
-app = modal.App(APP_NAME)
+app = modal.App(APP_NAME, include_source=True)  # skips scanning sys.modules to mount
+
+if not modal.is_local():  # in the container, so memory snapshots include the caches
+    warm_caches()
 
 # -----------------------------------------------------------------------------
 
@@ -844,6 +1960,12 @@ app = modal.App(APP_NAME)
     image=IMAGE,
     timeout=FE_TIMEOUT,
     scaledown_window=FE_SCALEDOWN_WINDOW,
+    enable_memory_snapshot=True,
+    secrets=[  # for /purge, taken from the deploying shell
+        modal.Secret.from_dict(
+            {k: os.environ[k] for k in ("PURGE_URL", "PURGE_TOKEN") if k in os.environ}
+        )
+    ],
 )
 @modal.concurrent(max_inputs=FE_ALLOW_CONCURRENT_INPUTS)
 @modal.asgi_app()
@@ -852,4 +1974,46 @@ def modal_get():
 
 
 if __name__ == "__main__":
-    fh.serve(app="f_app")
+    parser = argparse.ArgumentParser(description=f"{NAME} frontend")
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=[
+            "serve",
+            "css",
+            "vendor",
+            "images",
+            "export",
+            "purge",
+            "startup",
+            "bench",
+        ],
+        default="serve",
+    )
+    parser.add_argument("--site", help="deployed URL to purge the changes of")
+    bench = parser.add_argument_group("bench")
+    bench.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 64])
+    bench.add_argument("--requests", type=int, default=500, help="per case and level")
+    bench.add_argument("--out", type=Path, help="write the results as JSON")
+    bench.add_argument("--baseline", type=Path, help="compare with earlier --out")
+    args = parser.parse_args()
+    if args.command != "serve":  # requests made by the commands are not traffic
+        f_app.state.access_log = None
+    if args.command == "css":
+        build_css()
+    elif args.command == "vendor":
+        vendor_icons()
+        vendor_js()
+        vendor_css()
+    elif args.command == "images":
+        build_images()
+    elif args.command == "export":
+        export_site()
+    elif args.command == "purge":
+        purge_changed(args.site)
+    elif args.command == "startup":
+        bench_startup()
+    elif args.command == "bench":
+        bench_routes(args.concurrency, args.requests, args.out, args.baseline)
+    else:
+        fh.serve(app="f_app")